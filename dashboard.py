@@ -1,10 +1,9 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+import numpy as np
 from datetime import datetime
+from html import escape
 import os
-from supabase import create_client
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -26,6 +25,14 @@ st.markdown("""
         text-align: center;
         margin-bottom: 2rem;
     }
+    .metric-grid {
+        display: flex;
+        flex-wrap: wrap;
+        justify-content: space-between;
+    }
+    .metric-grid .metric-card {
+        flex: 1 1 0;
+    }
     .metric-card {
         background-color: #f0f2f6;
         padding: 1rem;
@@ -44,11 +51,36 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+PRODUCT_COLUMNS = ['rings', 'pendants', 'earrings', 'bracelets']
+TARGET_RATIOS = np.array([40, 25, 20, 15])  # target % per PRODUCT_COLUMNS entry
+
+
+@st.cache_resource
+def _get_supabase():
+    """Shared Supabase client, created once per process and reused across reruns"""
+    from supabase import create_client
+    return create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY"))
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _fetch(table_name, date=None, limit=None):
+    """Run the Supabase query and return the raw rows; cached per (table, date, limit)"""
+    query = _get_supabase().table(table_name).select(
+        "Date, rings, pendants, earrings, bracelets"
+    )
+    if date:
+        query = query.filter("Date", "eq", date)
+    else:
+        if limit:
+            query = query.order("Date", desc=True).limit(limit)
+        else:
+            query = query.order("Date", desc=True)
+    return tuple(query.execute().data)
+
+
 class Dashboard:
     def __init__(self):
-        self.SUPABASE_URL = os.getenv("SUPABASE_URL")
-        self.SUPABASE_KEY = os.getenv("SUPABASE_KEY")
-        self.supabase = create_client(self.SUPABASE_URL, self.SUPABASE_KEY)
+        self.supabase = _get_supabase()
         self.table_name = "inventorypacer"  # your Supabase table
     
     def get_table_data(self, date=None, limit=None):
@@ -57,21 +89,12 @@ class Dashboard:
         - date: string in 'dd-mm-yyyy', fetches that day
         - limit: int, fetches last n records
         """
-        query = self.supabase.table(self.table_name).select(
-            "Date, rings, pendants, earrings, bracelets"
-        )
-        if date:
-            query = query.filter("Date", "eq", date)
-        else:
-            if limit:
-                query = query.order("Date", desc=True).limit(limit)
-            else:
-                query = query.order("Date", desc=True)
         try:
-            response = query.execute()
-            if response.data:
-                df = pd.DataFrame(response.data)
+            rows = _fetch(self.table_name, date=date, limit=limit)
+            if rows:
+                df = pd.DataFrame(list(rows))
                 df.rename(columns={"Date": "date"}, inplace=True)
+                df[PRODUCT_COLUMNS] = df[PRODUCT_COLUMNS].apply(pd.to_numeric, errors='coerce').fillna(0).astype("int32")
                 return df
             else:
                 return pd.DataFrame()
@@ -79,64 +102,97 @@ class Dashboard:
             st.error(f"❌ Error fetching data: {e}")
             return pd.DataFrame()
     
+    def get_distinct_dates(self):
+        """
+        Fetch the available dates, latest first.
+        Only the Date column is transferred; count columns stay on the server.
+        """
+        try:
+            response = self.supabase.table(self.table_name).select("Date").execute()
+        except Exception as e:
+            st.error(f"❌ Error fetching dates: {e}")
+            return []
+
+        return sorted(
+            {row["Date"] for row in response.data},
+            key=lambda x: datetime.strptime(x, "%d-%m-%Y"),
+            reverse=True
+        )
+
     def get_latest_data(self):
         df = self.get_table_data(limit=1)
         return df
     
-    def get_ratio_analysis(self, data_df):
-        """Calculate current ratios vs target ratios"""
-        if data_df.empty:
+    def get_ratio_analysis(self, counts, total_products):
+        """
+        Calculate current ratios vs target ratios
+        - counts: ndarray of counts ordered like PRODUCT_COLUMNS
+        - total_products: sum of counts
+        """
+        if counts.size == 0:
             return None
-        
-        target_ratios = {
-            'rings': 40,
-            'pendants': 25, 
-            'earrings': 20,
-            'bracelets': 15
-        }
-        
-        analysis = []
-        total_products = data_df['total_products'].iloc[0]
-        
-        for product_type, target_percent in target_ratios.items():
-            current_count = data_df[product_type].iloc[0]
-            current_percent = (current_count / total_products * 100) if total_products > 0 else 0
-            target_count = (target_percent / 100) * total_products
-            difference = target_count - current_count
-            
-            analysis.append({
-                'Product Type': product_type.title(),
-                'Current Count': current_count,
-                'Current %': round(current_percent, 1),
-                'Target %': target_percent,
-                'Target Count': round(target_count, 1),
-                'Difference': round(difference, 1),
-                'Status': 'Above Target' if difference < 0 else 'Below Target'
-            })
-        
-        return pd.DataFrame(analysis)
 
-def main():
-    dashboard = Dashboard()
-    
-    st.markdown('<h1 class="main-header">🏪 Shopify Product Dashboard</h1>', unsafe_allow_html=True)
+        if total_products > 0:
+            current_percent = counts / total_products * 100
+        else:
+            current_percent = np.zeros(len(counts))
+        target_count = TARGET_RATIOS / 100 * total_products
+        difference = target_count - counts
 
-        # Fetch the latest date data
-    all_data = dashboard.get_table_data()
-    if all_data.empty:
-        st.warning("⚠️ No data available in Supabase database.")
-        return
+        return pd.DataFrame({
+            'Product Type': [pt.title() for pt in PRODUCT_COLUMNS],
+            'Current Count': counts,
+            'Current %': current_percent.round(1),
+            'Target %': TARGET_RATIOS,
+            'Target Count': target_count.round(1),
+            'Difference': difference.round(1),
+            'Status': np.where(difference < 0, 'Above Target', 'Below Target')
+        })
 
-    # Get all available dates sorted (latest first)
-    all_data['date'] = pd.to_datetime(all_data['date'], format="%d-%m-%Y")
 
-    # Format dates for display (strings)
-    available_dates = sorted(
-        [d.strftime("%d-%m-%Y") for d in all_data['date'].unique()],
-        key=lambda x: datetime.strptime(x, "%d-%m-%Y"),
-        reverse=True
-    )
+@st.cache_resource
+def get_dashboard():
+    return Dashboard()
+
+
+# Plotly is imported inside the figure builders so it stays off the first-paint path
+
+@st.cache_data(show_spinner=False)
+def _pie_fig(values: tuple, names: tuple):
+    import plotly.express as px
+    return px.pie(values=values, names=names, title="Product Type Distribution",
+                  color_discrete_sequence=px.colors.qualitative.Set3)
+
+
+@st.cache_data(show_spinner=False)
+def _bar_fig(values: tuple, names: tuple):
+    import plotly.express as px
+    return px.bar(x=names, y=values, title="Product Counts by Type",
+                  labels={'x': 'Product Type', 'y': 'Count'},
+                  color=names, color_discrete_sequence=px.colors.qualitative.Set3)
 
+
+@st.cache_data(show_spinner=False)
+def _ratio_fig(names: tuple, current_pct: tuple, target_pct: tuple):
+    import plotly.graph_objects as go
+    fig_ratio = go.Figure()
+    fig_ratio.add_trace(go.Bar(
+        name='Current %', x=names, y=current_pct, marker_color='lightblue'
+    ))
+    fig_ratio.add_trace(go.Bar(
+        name='Target %', x=names, y=target_pct, marker_color='orange'
+    ))
+    fig_ratio.update_layout(title="Current vs Target Ratios", barmode='group',
+                            xaxis_title="Product Type", yaxis_title="Percentage (%)")
+    return fig_ratio
+
+
+@st.fragment
+def _render_for_date(dashboard, available_dates):
+    """
+    Date selector plus everything that depends on the selected date.
+    Runs as a fragment so changing the date reruns only this section.
+    """
     latest_date_str = available_dates[0]
 
     # --- Add date selector ---
@@ -165,50 +221,39 @@ def main():
 
     # --- Show date info ---
     st.info(f"Showing data for **{st.session_state.selected_date}**")
-    # Convert columns to integers
-    for col in ['rings', 'pendants', 'earrings', 'bracelets']:
-        data_df[col] = pd.to_numeric(data_df[col], errors='coerce').fillna(0).astype(int)
-
-    data_df['total_products'] = data_df[['rings', 'pendants', 'earrings', 'bracelets']].sum(axis=1)
+    counts = data_df.loc[0, PRODUCT_COLUMNS].to_numpy(dtype=np.int32)
+    total_products = int(counts.sum())
 
     # Latest snapshot section
     st.subheader("📅 Data Snapshot")
-    col1, col2, col3, col4, col5, col6 = st.columns(6)
-    
-    with col1:
-        st.metric("Date", data_df['date'].iloc[0])
-    with col2:
-        st.metric("Total Products", data_df['total_products'].iloc[0])
-    with col3:
-        st.metric("Rings", data_df['rings'].iloc[0])
-    with col4:
-        st.metric("Pendants", data_df['pendants'].iloc[0])
-    with col5:
-        st.metric("Earrings", data_df['earrings'].iloc[0])
-    with col6:
-        st.metric("Bracelets", data_df['bracelets'].iloc[0])
+    # One markdown block instead of six st.metric widgets
+    snapshot = [("Date", data_df['date'].iloc[0]), ("Total Products", total_products)]
+    snapshot += [(pt.title(), int(c)) for pt, c in zip(PRODUCT_COLUMNS, counts)]
+    st.markdown(
+        '<div class="metric-grid">'
+        + "".join(
+            f'<div class="metric-card">{label}<br><b>{escape(str(value))}</b></div>'
+            for label, value in snapshot
+        )
+        + '</div>',
+        unsafe_allow_html=True
+    )
     
     # Current Distribution
     st.subheader("📊 Current Product Distribution")
     col1, col2 = st.columns(2)
-    product_types = ['rings', 'pendants', 'earrings', 'bracelets']
-    counts = [data_df[pt].iloc[0] for pt in product_types]
-    labels = [pt.title() for pt in product_types]
+    counts_key = tuple(counts.tolist())
+    labels = tuple(pt.title() for pt in PRODUCT_COLUMNS)
     
     with col1:
-        fig_pie = px.pie(values=counts, names=labels, title="Product Type Distribution",
-                         color_discrete_sequence=px.colors.qualitative.Set3)
-        st.plotly_chart(fig_pie, use_container_width=True)
+        st.plotly_chart(_pie_fig(counts_key, labels), use_container_width=True)
     
     with col2:
-        fig_bar = px.bar(x=labels, y=counts, title="Product Counts by Type",
-                         labels={'x': 'Product Type', 'y': 'Count'},
-                         color=labels, color_discrete_sequence=px.colors.qualitative.Set3)
-        st.plotly_chart(fig_bar, use_container_width=True)
+        st.plotly_chart(_bar_fig(counts_key, labels), use_container_width=True)
     
     # Ratio Analysis
     st.subheader("🎯 Ratio Analysis vs Targets")
-    ratio_df = dashboard.get_ratio_analysis(data_df)
+    ratio_df = dashboard.get_ratio_analysis(counts, total_products)
     if ratio_df is not None:
         col1, col2 = st.columns(2)
         with col1:
@@ -222,37 +267,52 @@ def main():
                 use_container_width=True
             )
         with col2:
-            fig_ratio = go.Figure()
-            fig_ratio.add_trace(go.Bar(
-                name='Current %', x=ratio_df['Product Type'], y=ratio_df['Current %'], marker_color='lightblue'
-            ))
-            fig_ratio.add_trace(go.Bar(
-                name='Target %', x=ratio_df['Product Type'], y=ratio_df['Target %'], marker_color='orange'
-            ))
-            fig_ratio.update_layout(title="Current vs Target Ratios", barmode='group',
-                                    xaxis_title="Product Type", yaxis_title="Percentage (%)")
+            fig_ratio = _ratio_fig(
+                tuple(ratio_df['Product Type']),
+                tuple(ratio_df['Current %'].tolist()),
+                tuple(ratio_df['Target %'].tolist())
+            )
             st.plotly_chart(fig_ratio, use_container_width=True)
     
     # Recommendations
     st.subheader("💡 Recommendations")
     if ratio_df is not None:
         recommendations = []
-        for _, row in ratio_df.iterrows():
-            if row['Difference'] > 0:
+        for diff, product_type, current_count, target_count in zip(
+            ratio_df['Difference'].to_numpy(),
+            ratio_df['Product Type'].to_numpy(),
+            ratio_df['Current Count'].to_numpy(),
+            ratio_df['Target Count'].to_numpy()
+        ):
+            if diff > 0:
                 recommendations.append(
-                    f"📌 Upload **{abs(row['Difference']):.0f}** more **{row['Product Type']}** "
-                    f"(currently {row['Current Count']}, target {row['Target Count']:.0f})"
+                    f"📌 Upload **{abs(diff):.0f}** more **{product_type}** "
+                    f"(currently {current_count}, target {target_count:.0f})"
                 )
-            elif row['Difference'] < 0:
+            elif diff < 0:
                 recommendations.append(
-                    f"✅ **{row['Product Type']}** is above target by {abs(row['Difference']):.0f} units"
+                    f"✅ **{product_type}** is above target by {abs(diff):.0f} units"
                 )
         if recommendations:
             for rec in recommendations:
                 st.write(rec)
         else:
             st.success("🎉 All product categories are meeting or exceeding their targets!")
+
+
+def main():
+    dashboard = get_dashboard()
     
+    st.markdown('<h1 class="main-header">🏪 Shopify Product Dashboard</h1>', unsafe_allow_html=True)
+
+    # Get all available dates sorted (latest first)
+    available_dates = dashboard.get_distinct_dates()
+    if not available_dates:
+        st.warning("⚠️ No data available in Supabase database.")
+        return
+
+    _render_for_date(dashboard, available_dates)
+
     st.markdown("---")
     st.markdown(
         "**Dashboard Updates**: Automatically showing data for the most recent date available in Supabase."
@@ -1,8 +1,11 @@
 import os
 import json
 import logging
+from collections import Counter
 from datetime import datetime
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
 from dotenv import load_dotenv
 from utils.GetLogger import GetLogger
@@ -20,6 +23,13 @@ class ShopifyProductTracker:
         self.config = self._load_config(config_path)
         self.shopify_store = os.getenv("SHOPIFY_STORE")
         self.access_token = os.getenv("SHOPIFY_ACCESS_TOKEN")
+        self.session = requests.Session()
+        self.session.headers.update({"X-Shopify-Access-Token": self.access_token})
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=10,
+            max_retries=Retry(total=3, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504])
+        ))
         self.date_str = self.config.get("DATE")
         self.current_date = datetime.now().date().strftime("%d-%m-%Y")
         self.share_with = self.config.get("SHARE_WITH", [])
@@ -35,7 +45,7 @@ class ShopifyProductTracker:
         ).logger
         
         # Initialize components
-        # self.db_manager = DatabaseManager()
+        self.db_manager = DatabaseManager()
         self.ratio_calculator = RatioCalculator(self.target_ratios)
         credentials_path = os.path.join(os.getcwd(), "config", "google_service_account.json")
         # self.google_sheet_id = os.getenv("GOOGLE_SHEET_ID", "1iGiZ7PHUWUwnR8LJStyTQpoq1q6eQVd-cPiTlzKWfLg")
@@ -62,7 +72,7 @@ class ShopifyProductTracker:
 
     def _load_config(self, config_path):
         if not os.path.exists(config_path):
-            self.logger.error(f"Configuration file not found: {config_path}")
+            self.logger.error("Configuration file not found: %s", config_path)
             raise FileNotFoundError(f"Missing {config_path}")
         with open(config_path, "r") as f:
             return json.load(f)
@@ -76,9 +86,9 @@ class ShopifyProductTracker:
         """
         mode = self.config.get("FETCH_MODE", "BY_DATE").upper()
         base_url = f"https://{self.shopify_store}/admin/api/2024-10/products.json"
-        headers = {"X-Shopify-Access-Token": self.access_token}
 
-        params = {"limit": 250}
+        # Only request the fields used downstream; keeps each page small
+        params = {"limit": 250, "fields": "id,product_type,status,published_at"}
 
         # Apply filters based on mode
         if mode in ["BY_DATE", "ACTIVE_BY_DATE"]:
@@ -92,11 +102,11 @@ class ShopifyProductTracker:
         if mode in ["ACTIVE_ONLY", "ACTIVE_BY_DATE"]:
             params["status"] = "active"
 
-        self.logger.info(f"Fetching products using mode: {mode}")
+        self.logger.info("Fetching products using mode: %s", mode)
         all_products = []
 
         while True:
-            response = requests.get(base_url, headers=headers, params=params)
+            response = self.session.get(base_url, params=params)
             if response.status_code == 401:
                 self.logger.error("Unauthorized: Invalid or expired Shopify access token.")
                 raise PermissionError("Unauthorized Shopify API access.")
@@ -119,52 +129,47 @@ class ShopifyProductTracker:
                 p for p in all_products
                 if p.get("status") == "active" or p.get("published_at") is not None
             ]
-            self.logger.info(f"Fetched {len(active_products)} active products out of {len(all_products)} total.")
+            self.logger.info("Fetched %d active products out of %d total.", len(active_products), len(all_products))
             return active_products
 
-        self.logger.info(f"Fetched {len(all_products)} total products.")
+        self.logger.info("Fetched %d total products.", len(all_products))
         return all_products
 
     def summarize_and_export(self, products):
         product_types = ["Pendants", "Rings", "Earrings", "Bracelets"]
-        counts = {ptype.lower(): 0 for ptype in product_types}
-        
-        for p in products:
-            ptype = p.get("product_type", "").lower().strip()
-            if ptype in counts:
-                counts[ptype] += 1
+        type_counts = Counter(p.get("product_type", "").lower().strip() for p in products)
+        counts = {ptype.lower(): type_counts.get(ptype.lower(), 0) for ptype in product_types}
 
         # Update database
-        db_manager = DatabaseManager()
-        success = db_manager.upsert_product_counts(self.current_date, counts)
+        success = self.db_manager.upsert_product_counts(self.current_date, counts)
         if not success:
             self.logger.error("Failed to upsert product counts to database.")
             return None
         data = {"Date": self.current_date, **counts}
         df_row = pd.DataFrame([data])
 
-        # Save to Excel
+        # Save to CSV (single row, so no need for a full Excel workbook)
         folder_path = os.path.join("reports", self.date_str)
         os.makedirs(folder_path, exist_ok=True)
         timestamp = datetime.now().strftime("%H-%M-%S")
-        excel_path = os.path.join(folder_path, f"shopify_products_{self.date_str}_{timestamp}.xlsx")
-        df_row.to_excel(excel_path, index=False)
-        self.logger.info(f"Excel file saved: {excel_path}")
+        report_path = os.path.join(folder_path, f"shopify_products_{self.date_str}_{timestamp}.csv")
+        df_row.to_csv(report_path, index=False)
+        self.logger.info("CSV report saved: %s", report_path)
         # self.google_agent.append_data(df_row)
         # if self.share_with:
         #     self.google_agent.share_with_users(self.share_with, role="reader")
-        #     self.logger.info(f"Shared sheet with configured users: {self.share_with}")
+        #     self.logger.info("Shared sheet with configured users: %s", self.share_with)
 
         self._check_ratio_and_alert(counts)
 
-        return excel_path
+        return report_path
 
     def _check_ratio_and_alert(self, counts):
         """
         Enhanced ratio checking with recommendations
         Filters out overrepresented (negative difference) product types.
         """
-        self.logger.info(f"Checking product ratio for: {counts}")
+        self.logger.info("Checking product ratio for: %s", counts)
         
         total_products = sum(counts.values())
         if total_products == 0:
@@ -185,25 +190,23 @@ class ShopifyProductTracker:
             recommendations = self.ratio_calculator.get_recommendations(analysis)
             
             # Prepare summary data — only include rows where Difference > 0
-            summary_data = []
-            for product_type, data in analysis.items():
-                diff_value = data.get('adjusted_difference', data['next_upload_count'])
-                if diff_value > 0:  # ✅ include only underrepresented categories
-                    summary_data.append({
-                        'Product Type': product_type,
-                        'Current Count': data['current'],
-                        'Current %': f"{data['current_percent']:.1f}%",
-                        'Target %': f"{data['target_percent']:.1f}%",
-                        'Required Count': f"{data['required']:.1f}",
-                        'Next Upload Count': f"{diff_value:+.1f}"
-                    })
+            analysis_df = pd.DataFrame.from_dict(analysis, orient='index')
+            if not analysis_df.empty:
+                diff_values = analysis_df.get('adjusted_difference', analysis_df['next_upload_count'])
+                analysis_df = analysis_df.assign(diff_value=diff_values)[diff_values > 0]  # ✅ include only underrepresented categories
             
-            if not summary_data:
+            if analysis_df.empty:
                 self.logger.info("All product ratios are balanced or above target — no alert needed.")
                 return
             
-            import pandas as pd
-            df_summary = pd.DataFrame(summary_data)
+            df_summary = pd.DataFrame({
+                'Product Type': analysis_df.index,
+                'Current Count': analysis_df['current'].to_numpy(),
+                'Current %': analysis_df['current_percent'].map("{:.1f}%".format).to_numpy(),
+                'Target %': analysis_df['target_percent'].map("{:.1f}%".format).to_numpy(),
+                'Required Count': analysis_df['required'].map("{:.1f}".format).to_numpy(),
+                'Next Upload Count': analysis_df['diff_value'].map("{:+.1f}".format).to_numpy()
+            })
             
             # Build email content
             subject = f"Shopify Ratio Alert for {self.date_str}"
@@ -225,4 +228,5 @@ if __name__ == "__main__":
     tracker = ShopifyProductTracker()
     products = tracker.get_products()
     tracker.summarize_and_export(products)
+    tracker.mailer.close()
     tracker.logger.info("Process completed successfully.")
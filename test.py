@@ -1,9 +1,9 @@
 import os
 import logging
 import gspread
-from google.oauth2.service_account import Credentials
 from dotenv import load_dotenv
 import traceback
+from utils.google_sheet_agent import get_gspread_client
 
 # --- Setup Logging ---
 logging.basicConfig(
@@ -28,12 +28,7 @@ if not os.path.exists(GOOGLE_CREDENTIALS_PATH):
 try:
     # --- Authenticate using service account ---
     logging.info("🔑 Loading Google Service Account credentials...")
-    creds = Credentials.from_service_account_file(
-        GOOGLE_CREDENTIALS_PATH,
-        scopes=["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive"]
-    )
-
-    gc = gspread.authorize(creds)
+    gc = get_gspread_client(GOOGLE_CREDENTIALS_PATH)
 
     # --- Test sheet access ---
     logging.info("📊 Connecting to Google Sheet...")
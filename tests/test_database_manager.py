@@ -0,0 +1,55 @@
+import json
+import types
+import unittest
+from unittest import mock
+
+import httpx
+from postgrest import SyncPostgrestClient
+
+from utils import database_manager
+from utils.database_manager import DatabaseManager
+
+
+class UpsertProductCountsTest(unittest.TestCase):
+    """Exercise the upsert against the pinned postgrest-py client, with HTTP mocked out."""
+
+    def setUp(self):
+        self.requests = []
+
+        def handler(request):
+            self.requests.append(request)
+            return httpx.Response(201, json=json.loads(request.content))
+
+        postgrest = SyncPostgrestClient("http://supabase.test/rest/v1")
+        postgrest.session = httpx.Client(
+            base_url="http://supabase.test/rest/v1",
+            transport=httpx.MockTransport(handler)
+        )
+        fake_supabase = types.SimpleNamespace(table=postgrest.from_)
+        with mock.patch.object(database_manager, "_client", return_value=fake_supabase):
+            self.db = DatabaseManager()
+
+    def test_single_upsert_conflicts_on_date(self):
+        self.assertTrue(self.db.upsert_product_counts("17-10-2025", {"rings": 5, "pendants": 3}))
+
+        request = self.requests[0]
+        self.assertEqual(request.method, "POST")
+        self.assertEqual(request.url.params["on_conflict"], "Date")
+        self.assertIn("resolution=merge-duplicates", request.headers["prefer"])
+        self.assertEqual(json.loads(request.content), [{"Date": "17-10-2025", "rings": 5, "pendants": 3}])
+
+    def test_many_sends_one_request(self):
+        items = [("16-10-2025", {"rings": 1}), ("17-10-2025", {"rings": 2})]
+        self.assertTrue(self.db.upsert_product_counts_many(items))
+
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual(self.requests[0].url.params["on_conflict"], "Date")
+        self.assertEqual(len(json.loads(self.requests[0].content)), 2)
+
+    def test_many_with_no_items_skips_request(self):
+        self.assertTrue(self.db.upsert_product_counts_many([]))
+        self.assertEqual(self.requests, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -37,22 +37,22 @@ class GetLogger:
 
 def apply_logs_to_all_methods(decorator):
     def class_decorator(cls):
-        for attr_name in dir(cls):
-            if callable(getattr(cls, attr_name)) and (not attr_name.startswith('__') or attr_name == '__init__'):
-                original_attr = getattr(cls, attr_name)
-                decorated_attr = decorator(original_attr)
-                setattr(cls, attr_name, decorated_attr)
+        # Only methods defined on cls itself; inherited ones are left alone
+        for attr_name, attr in list(cls.__dict__.items()):
+            if inspect.isfunction(attr) and (not attr_name.startswith('__') or attr_name == '__init__'):
+                setattr(cls, attr_name, decorator(attr))
         return cls
     return class_decorator
 
 
 def log(func):
+    # Signature is static per function, so resolve it once at decoration time
+    sig = inspect.signature(func)
+
     @wraps(func)
     def wrapper(self, *args, **kwargs):
         logger = getattr(self, 'logger', None)
-        if logger:
-            # Get the function signature
-            sig = inspect.signature(func)
+        if logger and logger.isEnabledFor(logging.INFO):
             bound_args = sig.bind(self, *args, **kwargs)
             bound_args.apply_defaults()
 
@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 from supabase import create_client, Client
 from datetime import datetime
 from dotenv import load_dotenv
@@ -8,11 +9,16 @@ import json
 
 load_dotenv()
 
+
+@lru_cache(maxsize=1)
+def _client() -> Client:
+    """Shared Supabase client, created once per process"""
+    return create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY"))
+
+
 class DatabaseManager:
     def __init__(self):
-        self.SUPABASE_URL = os.getenv("SUPABASE_URL")
-        self.SUPABASE_KEY = os.getenv("SUPABASE_KEY")
-        self.supabase = create_client(self.SUPABASE_URL, self.SUPABASE_KEY)
+        self.supabase = _client()
         self.table_name = "inventorypacer"
 
     def check_date_exists(self, date):
@@ -59,47 +65,36 @@ class DatabaseManager:
 
     def upsert_product_counts(self, date, counts):
         """
-        Upsert product counts - insert if date doesn't exist, update if counts are different
+        Upsert product counts in a single request - insert if date doesn't exist, overwrite otherwise.
+        Relies on a unique constraint on the "Date" column.
         
         Args:
             date (str): The date in format 'dd-mm-yyyy'
             counts (dict): Dictionary with product counts like {'rings': 5, 'pendants': 3, ...}
         """
+        return self.upsert_product_counts_many([(date, counts)])
+
+    def upsert_product_counts_many(self, items):
+        """
+        Upsert counts for several dates in one request (e.g. a backfill).
+        
+        Args:
+            items (list): List of (date, counts) tuples, date in format 'dd-mm-yyyy'
+        """
+        rows = [{"Date": date, **counts} for date, counts in items]
+        if not rows:
+            return True
         try:
-            # Prepare the data for insertion/update
-            jewelry_data = counts.copy()
-            jewelry_data['Date'] = date
-            
-            # Check if date already exists
-            existing_record = self.check_date_exists(date)
-            
-            if existing_record:
-                # Date exists, check if counts are different
-                needs_update = False
-                update_data = {}
-                
-                for key, new_value in counts.items():
-                    existing_value = existing_record.get(key.lower(), None)
-                    # Convert both to string for comparison to handle different data types
-                    if str(existing_value) != str(new_value):
-                        needs_update = True
-                        update_data[key] = new_value
-                        print(f"{key}: {existing_value} → {new_value}")
-                
-                if needs_update:
-                    print(f"🔄 Updating existing record for date {date}")
-                    success = self.update_jewelry_data(existing_record['id'], update_data)
-                    return success
-                else:
-                    print(f"✅ Data unchanged for date {date}, no update needed")
-                    return True
-                    
-            else:
-                # Date doesn't exist, insert new record
-                print(f"🆕 Inserting new record for date {date}")
-                success = self.insert_jewelry_data(jewelry_data)
-                return success
-                
+            query = self.supabase.table(self.table_name).upsert(rows)
+            # postgrest-py 0.10.x has no on_conflict kwarg; without it PostgREST
+            # resolves conflicts on the "id" PK and would insert duplicate dates
+            query.params = query.params.add("on_conflict", "Date")
+            query.execute()
+            print(f"✅ Upserted {len(rows)} record(s): {', '.join(row['Date'] for row in rows)}")
+            return True
+        except JSONDecodeError as e:
+            print(f"JSON decode error during upsert: {e}")
+            return True
         except Exception as e:
             print(f"❌ Error in upsert operation: {e}")
             return False
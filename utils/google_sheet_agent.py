@@ -1,26 +1,50 @@
 import gspread
+from gspread.utils import rowcol_to_a1
 from google.oauth2.service_account import Credentials
 from googleapiclient.discovery import build
 import logging
+from functools import lru_cache
+
+logger = logging.getLogger('shopify_tracker')
+
+SCOPES = [
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive"
+]
+
+
+@lru_cache(maxsize=None)
+def get_credentials(credentials_path):
+    """Load the service-account credentials once per file; tokens refresh themselves"""
+    return Credentials.from_service_account_file(credentials_path, scopes=SCOPES)
+
+
+@lru_cache(maxsize=None)
+def get_gspread_client(credentials_path):
+    """Authorized gspread client shared by every caller using the same credentials file"""
+    return gspread.authorize(get_credentials(credentials_path))
+
+
+@lru_cache(maxsize=None)
+def get_drive_service(credentials_path):
+    """Drive v3 service shared by every caller using the same credentials file"""
+    return build("drive", "v3", credentials=get_credentials(credentials_path))
+
 
 class GoogleSheetAgent:
     def __init__(self, credentials_path, sheet_id=None):
-        self.logger = logging.getLogger('shopify_tracker')
         self.sheet_id = sheet_id
         self.credentials_path = credentials_path
 
         try:
-            self.scopes = [
-                "https://www.googleapis.com/auth/spreadsheets",
-                "https://www.googleapis.com/auth/drive"
-            ]
-            self.creds = Credentials.from_service_account_file(credentials_path, scopes=self.scopes)
-            self.client = gspread.authorize(self.creds)
+            self.scopes = SCOPES
+            self.creds = get_credentials(credentials_path)
+            self.client = get_gspread_client(credentials_path)
             self.sheet = self.client.open_by_key(sheet_id).sheet1
-            self.drive_service = build("drive", "v3", credentials=self.creds)
-            self.logger.info("Connected to Google Sheet successfully.")
+            self.drive_service = get_drive_service(credentials_path)
+            logger.info("Connected to Google Sheet successfully.")
         except Exception as e:
-            self.logger.error(f"Failed to connect to Google Sheet: {e}")
+            logger.error(f"Failed to connect to Google Sheet: {e}")
             self.sheet = None
             self.drive_service = None
 
@@ -30,39 +54,46 @@ class GoogleSheetAgent:
         Updates existing row if date exists, otherwise appends.
         """
         if self.sheet is None:
-            self.logger.error("No valid Google Sheet connection. Skipping upload.")
+            logger.error("No valid Google Sheet connection. Skipping upload.")
             return
 
         try:
-            existing_data = self.sheet.get_all_values()
             headers = df.columns.tolist()
             new_row = df.values.tolist()[0]  # Get first row from dataframe
+            # Only the columns we write (A..last df column), not the whole sheet
+            last_col = rowcol_to_a1(1, len(new_row))[:-1]
+            existing_data = self.sheet.get(f"A:{last_col}")
             
             # Add headers if sheet is empty
             if not existing_data:
-                self.sheet.append_row(headers, value_input_option='USER_ENTERED')
-                self.sheet.append_row(new_row, value_input_option='USER_ENTERED')
-                self.logger.info("Headers + new row uploaded to Google Sheet.")
+                self.sheet.append_rows([headers, new_row], value_input_option='USER_ENTERED')
+                logger.info("Headers + new row uploaded to Google Sheet.")
                 return
 
             # Check if date exists and update
             date_to_find = new_row[0]  # Assuming first column is Date
-            date_col_index = 0
-            
-            for i, row in enumerate(existing_data[1:], start=2):  # Skip header row
-                if row and row[date_col_index] == date_to_find:
-                    # Update existing row
-                    for col_idx, value in enumerate(new_row):
-                        self.sheet.update_cell(i, col_idx + 1, value)
-                    self.logger.info(f"Updated existing row for date {date_to_find}")
+            date_column = [row[0] if row else "" for row in existing_data]
+            if date_to_find in date_column[1:]:  # Skip header row
+                i = date_column.index(date_to_find, 1) + 1  # Sheet rows are 1-based
+                # Sheets returns strings, so compare stringified values
+                if [str(x) for x in existing_data[i - 1]] == [str(x) for x in new_row]:
+                    logger.info(f"Row for date {date_to_find} unchanged, skipping update")
                     return
+                # Update existing row in a single API call
+                self.sheet.update(
+                    values=[new_row],
+                    range_name=f"A{i}:{rowcol_to_a1(i, len(new_row))}",
+                    value_input_option='USER_ENTERED'
+                )
+                logger.info(f"Updated existing row for date {date_to_find}")
+                return
             
             # If date not found, append new row
             self.sheet.append_row(new_row, value_input_option='USER_ENTERED')
-            self.logger.info(f"Appended new row for date {date_to_find}")
+            logger.info(f"Appended new row for date {date_to_find}")
 
         except Exception as e:
-            self.logger.error(f"Failed to update Google Sheet: {e}")
+            logger.error(f"Failed to update Google Sheet: {e}")
 
     def share_with_users(self, emails, role="reader"):
         """
@@ -70,7 +101,7 @@ class GoogleSheetAgent:
         role = 'reader' (view only) or 'writer' (edit access)
         """
         if not self.drive_service:
-            self.logger.error("Drive service not initialized; cannot share file.")
+            logger.error("Drive service not initialized; cannot share file.")
             return
 
         for email in emails:
@@ -85,6 +116,6 @@ class GoogleSheetAgent:
                     body=permission,
                     fields="id"
                 ).execute()
-                self.logger.info(f"Shared sheet with {email} ({role}).")
+                logger.info(f"Shared sheet with {email} ({role}).")
             except Exception as e:
-                self.logger.error(f"Failed to share with {email}: {e}")
+                logger.error(f"Failed to share with {email}: {e}")
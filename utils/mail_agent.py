@@ -1,16 +1,81 @@
+import html
 import smtplib
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from email.utils import formataddr, getaddresses
 import pandas as pd
 import logging
 
+logger = logging.getLogger('shopify_tracker')
+
+def _df_to_html_fast(df):
+    """
+    Render a small DataFrame as a bordered HTML table without pandas' to_html formatter.
+    """
+    head = "".join(f"<th>{html.escape(str(col))}</th>" for col in df.columns)
+    body = "".join(
+        "<tr>" + "".join(f"<td>{html.escape(str(value))}</td>" for value in row) + "</tr>"
+        for row in df.itertuples(index=False)
+    )
+    return f'<table border="1"><thead><tr>{head}</tr></thead><tbody>{body}</tbody></table>'
+
+
+def _parse_addresses(value):
+    """
+    Split a comma-separated string or a list of addresses into (name, address) pairs.
+    """
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = [value]
+    return [(name, addr) for name, addr in getaddresses(value) if addr]
+
+
 class Mailer:
-    def __init__(self, sender, password, receiver, cc_ids):
+    def __init__(self, sender, password, receiver, cc_ids=None):
         self.sender = sender
         self.password = password
         self.receiver = receiver
-        self.receiver_cc = cc_ids
-        self.logger = logging.getLogger('shopify_tracker')
+        # receiver / cc_ids may be a list or a comma-separated string; normalize once here
+        to_pairs = _parse_addresses(receiver)
+        cc_pairs = _parse_addresses(cc_ids)
+        self._to_header = ", ".join(formataddr(pair) for pair in to_pairs)
+        self._cc_header = ", ".join(formataddr(pair) for pair in cc_pairs)
+        self._rcpt_list = [addr for _, addr in to_pairs + cc_pairs]
+        self._smtp = None
+
+    def _get_smtp(self):
+        """
+        Return an authenticated SMTP connection, reusing the open one if it is still alive.
+        """
+        if self._smtp is not None:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._smtp.close()
+            self._smtp = None
+
+        server = smtplib.SMTP('smtp.gmail.com', 587)
+        try:
+            server.starttls()
+            server.login(self.sender, self.password)
+        except Exception:
+            server.close()
+            raise
+        self._smtp = server
+        return server
+
+    def close(self):
+        """Close the cached SMTP connection, if any."""
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            self._smtp.close()
+        self._smtp = None
 
     def send_alert(self, subject, body, df):
         """
@@ -19,11 +84,12 @@ class Mailer:
         try:
             msg = MIMEMultipart('alternative')
             msg['From'] = self.sender
-            msg['To'] = self.receiver
-            msg['Cc'] = self.receiver_cc
+            msg['To'] = self._to_header
+            if self._cc_header:
+                msg['Cc'] = self._cc_header
             msg['Subject'] = subject
 
-            html_table = df.to_html(index=False, border=1)
+            html_table = _df_to_html_fast(df)
             html_content = f"""
             <html>
                 <body>
@@ -35,11 +101,8 @@ class Mailer:
             """
             msg.attach(MIMEText(html_content, 'html'))
 
-            with smtplib.SMTP('smtp.gmail.com', 587) as server:
-                server.starttls()
-                server.login(self.sender, self.password)
-                server.send_message(msg)
+            self._get_smtp().send_message(msg, to_addrs=self._rcpt_list)
 
-            self.logger.info(f" Email sent successfully to {self.receiver}.")
+            logger.info(f" Email sent successfully to {self._to_header}.")
         except Exception as e:
-            self.logger.error(f" Failed to send email: {e}")
+            logger.error(f" Failed to send email: {e}")
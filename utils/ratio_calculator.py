@@ -1,15 +1,19 @@
 import logging
 from typing import Dict, List
+import numpy as np
+
+logger = logging.getLogger('shopify_tracker')
 
 class RatioCalculator:
     def __init__(self, target_ratios: Dict[str, float]):
         self.target_ratios = target_ratios
-        self.logger = logging.getLogger('shopify_tracker')
+        self._target_items = tuple(target_ratios.items())
+        self._targets = np.array([target for _, target in self._target_items], dtype=np.float64)
         
         # Validate ratios sum to 100
         total_ratio = sum(target_ratios.values())
         if abs(total_ratio - 100) > 0.1:
-            self.logger.warning(f"Target ratios sum to {total_ratio}%, not 100%")
+            logger.warning(f"Target ratios sum to {total_ratio}%, not 100%")
 
     def calculate_required_uploads(self, current_counts: Dict[str, int]) -> Dict[str, Dict]:
         """
@@ -20,30 +24,27 @@ class RatioCalculator:
         if total_current == 0:
             return {"error": "No products available for analysis"}
         
-        # Calculate current percentages
-        current_percentages = {}
-        for product_type, count in current_counts.items():
-            if product_type in self.target_ratios:
-                current_percentages[product_type] = (count / total_current) * 100
+        # Vectorized over the target product types, in target_ratios order
+        current = [current_counts.get(k, 0) for k, _ in self._target_items]  # one lookup per key
+        counts = np.array(current, dtype=np.float64)
+        current_percentages = counts / total_current * 100
+        required = self._targets / 100 * total_current
+        diff = required - counts
         
-        # Calculate required counts
+        # ✅ Keep only positive differences (need to upload more)
         required_counts = {}
-        for product_type, target_percent in self.target_ratios.items():
-            required_count = (target_percent / 100) * total_current
-            diff = required_count - current_counts.get(product_type, 0)
-            
-            # ✅ Keep only positive differences (need to upload more)
-            if diff > 0:
-                required_counts[product_type] = {
-                    'current': current_counts.get(product_type, 0),
-                    'required': round(required_count, 2),
-                    'next_upload_count': round(diff),  # ← renamed and rounded
-                    'current_percent': round(current_percentages.get(product_type, 0), 1),
-                    'target_percent': target_percent
-                }
+        for idx in np.flatnonzero(diff > 0):
+            product_type, target_percent = self._target_items[idx]
+            required_counts[product_type] = {
+                'current': current[idx],
+                'required': round(float(required[idx]), 2),
+                'next_upload_count': round(float(diff[idx])),  # ← renamed and rounded
+                'current_percent': round(float(current_percentages[idx]), 1),
+                'target_percent': target_percent
+            }
         
         if not required_counts:
-            self.logger.info("All product categories meet or exceed target ratios.")
+            logger.info("All product categories meet or exceed target ratios.")
         
         return required_counts
 